@@ -9,7 +9,18 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import functools
+import hashlib
+import inspect
+import os
+import uuid
 from datetime import datetime
+from pathlib import Path
+
+# Copy-on-Write lets filtered slices be read (and relabelled) without .copy();
+# it is always on from pandas 3, where the option is deprecated
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -42,95 +53,227 @@ st.markdown("""
 # ============================================================================
 # LOAD DATA FUNCTIONS
 # ============================================================================
-@st.cache_data
+def _cached_parquet(csv_path):
+    """Keep a Parquet copy of the parsed CSV next to it, rebuilt when the CSV
+    is newer or the parsing code changes (its hash is in the name)."""
+    def decorator(loader):
+        # The shared header helper shapes every frame too, so it is part of the stamp
+        source = ''.join(inspect.getsource(f) for f in (loader, _norm_cols))
+        stamp = hashlib.md5(source.encode()).hexdigest()[:8]
+        csv_file = Path(csv_path)
+        pq_path = csv_file.with_suffix(f'.{stamp}.parquet')
+
+        @functools.wraps(loader)
+        def wrapper():
+            if not csv_file.exists():
+                return loader()
+            try:
+                if pq_path.stat().st_mtime >= csv_file.stat().st_mtime:
+                    return pd.read_parquet(pq_path, engine='pyarrow')
+            except Exception:
+                pass  # missing, unreadable or truncated sidecar: reparse the CSV
+            df = loader()
+            if df is not None:
+                # Write to a temp file and swap it in, so readers never see a partial sidecar
+                tmp_path = pq_path.with_name(f'{pq_path.name}.{uuid.uuid4().hex}.tmp')
+                try:
+                    df.to_parquet(tmp_path, engine='pyarrow', compression='zstd')
+                    os.replace(tmp_path, pq_path)
+                    for stale in csv_file.parent.glob(f'{csv_file.stem}.*.parquet'):
+                        if stale != pq_path:
+                            stale.unlink(missing_ok=True)
+                except OSError:
+                    # read-only deployments just keep parsing the CSV
+                    tmp_path.unlink(missing_ok=True)
+            return df
+        return wrapper
+    return decorator
+
+def _norm_cols(df, rename=None):
+    # Strip/lower-case headers in one pass, applying any per-file renames
+    rename = rename or {}
+    df.columns = [rename.get(c.strip(), c.strip().lower()) for c in df.columns]
+    return df
+
+@st.cache_data(show_spinner=False)
+@_cached_parquet('circuits.csv')
 def load_circuits():
     try:
-        circuits = pd.read_csv('circuits.csv')
-        circuits.columns = circuits.columns.str.strip().str.lower()
-        if circuits.columns[0] == 's':
-            circuits.columns = ['circuitid'] + list(circuits.columns[1:])
+        circuits = pd.read_csv('circuits.csv', engine='pyarrow',
+            usecols=['s', 'name', 'location', 'country', 'lat', 'lng'],
+            dtype={'s': 'int32', 'name': 'category', 'location': 'category', 'country': 'category'})
+        # circuits.csv ships its id column as 's'
+        circuits = _norm_cols(circuits, {'s': 'circuitid'})
         circuits = circuits.dropna(subset=['lat', 'lng'])
         return circuits
     except: return None
 
-@st.cache_data
+@st.cache_data(show_spinner=False)
+@_cached_parquet('races.csv')
 def load_races():
     try:
-        races = pd.read_csv('races.csv')
-        races.columns = races.columns.str.strip().str.lower()
-        races['date'] = pd.to_datetime(races['date'], errors='coerce')
+        races = pd.read_csv('races.csv', engine='pyarrow',
+            usecols=['raceId', 'year', 'circuitId'],
+            dtype={'raceId': 'int32', 'year': 'int16', 'circuitId': 'int32'})
+        races = _norm_cols(races)
         return races
     except: return None
 
-@st.cache_data
+@st.cache_data(show_spinner=False)
+@_cached_parquet('pit_stops.csv')
 def load_pit_stops():
     try:
-        pit_stops = pd.read_csv('pit_stops.csv')
-        pit_stops.columns = pit_stops.columns.str.strip().str.lower()
-        if 'duration' in pit_stops.columns:
-            pit_stops['duration'] = pd.to_numeric(pit_stops['duration'], errors='coerce')
-        if 'milliseconds' in pit_stops.columns:
-            pit_stops['milliseconds'] = pd.to_numeric(pit_stops['milliseconds'], errors='coerce')
-            if 'duration' not in pit_stops.columns or pit_stops['duration'].isna().sum() > len(pit_stops) * 0.5:
-                pit_stops['duration'] = pit_stops['milliseconds'] / 1000
-        pit_stops['lap'] = pd.to_numeric(pit_stops['lap'], errors='coerce')
-        pit_stops['stop'] = pd.to_numeric(pit_stops['stop'], errors='coerce')
+        # duration is read as text: stops over a minute are stored as "m:ss.fff"
+        pit_stops = pd.read_csv('pit_stops.csv', engine='pyarrow', na_values=['\\N'],
+            usecols=['raceId', 'driverId', 'stop', 'lap', 'duration', 'milliseconds'],
+            dtype={'raceId': 'int32', 'driverId': 'int32', 'stop': 'int8', 'lap': 'int16',
+                   'duration': 'string', 'milliseconds': 'Int32'})
+        pit_stops = _norm_cols(pit_stops)
+        pit_stops['duration'] = pd.to_numeric(pit_stops['duration'], errors='coerce').astype('float32')
+        if pit_stops['duration'].isna().sum() > len(pit_stops) * 0.5:
+            pit_stops['duration'] = np.divide(pit_stops['milliseconds'].to_numpy(dtype=np.float64, na_value=np.nan), 1000, dtype=np.float32)
         pit_stops = pit_stops.dropna(subset=['duration'])
+        # Unnamed raceid index so per-season slicing is an index lookup and
+        # 'raceid' stays unambiguous as a merge key; rows run in race order
+        # (raceid, lap, stop) so season slices are contiguous and pre-grouped
+        pit_stops = pit_stops.sort_values(['raceid', 'lap', 'stop'], kind='stable')
+        pit_stops = pit_stops.set_index('raceid', drop=False).rename_axis(None)
         return pit_stops
     except: return None
 
-@st.cache_data
+@st.cache_data(show_spinner=False)
+@_cached_parquet('constructors.csv')
 def load_constructors():
     try:
-        constructors = pd.read_csv('constructors.csv')
-        constructors.columns = constructors.columns.str.strip().str.lower()
+        constructors = pd.read_csv('constructors.csv', engine='pyarrow',
+            usecols=['constructorId', 'name'],
+            dtype={'constructorId': 'int32', 'name': 'category'})
+        constructors = _norm_cols(constructors)
         return constructors
     except: return None
 
-@st.cache_data
+# Big frames are shared via cache_resource (no pickle copy per rerun): treat as read-only
+@st.cache_resource(show_spinner=False)
+@_cached_parquet('results.csv')
 def load_results():
     try:
-        results = pd.read_csv('results.csv')
-        results.columns = results.columns.str.strip().str.lower()
-        results['position'] = pd.to_numeric(results['position'], errors='coerce')
-        results['points'] = pd.to_numeric(results['points'], errors='coerce').fillna(0)
-        results['grid'] = pd.to_numeric(results.get('grid', 0), errors='coerce')
+        results = pd.read_csv('results.csv', engine='pyarrow', na_values=['\\N'],
+            usecols=['raceId', 'driverId', 'constructorId', 'position', 'points'],
+            dtype={'raceId': 'int32', 'driverId': 'int32', 'constructorId': 'int32',
+                   'position': 'Int16', 'points': 'float32'})
+        results = _norm_cols(results)
+        results['points'] = results['points'].fillna(0)
+        results = results.set_index('raceid', drop=False).rename_axis(None).sort_index(kind='stable')
         return results
     except: return None
 
-@st.cache_data
+@st.cache_data(show_spinner=False)
+@_cached_parquet('qualifying.csv')
 def load_qualifying():
     try:
-        qualifying = pd.read_csv('qualifying.csv')
-        qualifying.columns = qualifying.columns.str.strip().str.lower()
-        qualifying['position'] = pd.to_numeric(qualifying['position'], errors='coerce')
+        qualifying = pd.read_csv('qualifying.csv', engine='pyarrow', na_values=['\\N'],
+            usecols=['raceId', 'driverId', 'position'],
+            dtype={'raceId': 'int32', 'driverId': 'int32', 'position': 'Int16'})
+        qualifying = _norm_cols(qualifying)
+        qualifying = qualifying.set_index('raceid', drop=False).rename_axis(None).sort_index(kind='stable')
         return qualifying
     except: return None
 
-@st.cache_data
+@st.cache_data(show_spinner=False)
+@_cached_parquet('drivers.csv')
 def load_drivers():
     try:
-        drivers = pd.read_csv('drivers.csv')
-        drivers.columns = drivers.columns.str.strip().str.lower()
-        # Create full name
-        if 'forename' in drivers.columns and 'surname' in drivers.columns:
-            drivers['fullname'] = drivers['forename'] + ' ' + drivers['surname']
+        # Only checked for presence (the Phase 4 names warning): read just the id
+        drivers = pd.read_csv('drivers.csv', engine='pyarrow',
+            usecols=['driverId'], dtype={'driverId': 'int32'})
+        drivers = _norm_cols(drivers)
         return drivers
     except: return None
 
-@st.cache_data
+# Shared via cache_resource like load_results: treat as read-only
+@st.cache_resource(show_spinner=False)
+@_cached_parquet('lap_times.csv')
 def load_lap_times():
     try:
-        lap_times = pd.read_csv('lap_times.csv')
-        lap_times.columns = lap_times.columns.str.strip().str.lower()
-        # Convert time to numeric (milliseconds)
-        if 'milliseconds' in lap_times.columns:
-            lap_times['milliseconds'] = pd.to_numeric(lap_times['milliseconds'], errors='coerce')
-        lap_times['lap'] = pd.to_numeric(lap_times['lap'], errors='coerce')
-        lap_times['position'] = pd.to_numeric(lap_times['position'], errors='coerce')
+        lap_times = pd.read_csv('lap_times.csv', engine='pyarrow',
+            usecols=['raceId', 'driverId', 'lap', 'position', 'milliseconds'],
+            dtype={'raceId': 'int32', 'driverId': 'int32', 'lap': 'int16',
+                   'position': 'Int16', 'milliseconds': 'Int32'})
+        lap_times = _norm_cols(lap_times)
+        # Convert milliseconds to seconds once per session
+        lap_times['time_seconds'] = np.divide(lap_times['milliseconds'].to_numpy(dtype=np.float64, na_value=np.nan), 1000, dtype=np.float32)
+        lap_times = lap_times.set_index('raceid', drop=False).rename_axis(None).sort_index(kind='stable')
         return lap_times
     except: return None
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def season_race_ids(years):
+    # Sorted unique int32 ids, matching the raceid index of the race-keyed tables
+    races = load_races()
+    race_ids = races.loc[races['year'].isin(years), 'raceid'] if years else races['raceid']
+    return np.unique(race_ids.to_numpy(dtype=np.int32))
+
+def season_slice(df, years):
+    # Per-season rows of a raceid-indexed table. Not cached itself: callers are
+    # cached per season and keep only their small outputs, not the slices
+    return None if df is None else df.loc[df.index.intersection(season_race_ids(years))]
+
+@st.cache_data(show_spinner=False)
+def load_quali_race():
+    # Qualifying joined to race results once per session; phases slice it by raceid index
+    qualifying, results = load_qualifying(), load_results()
+    if qualifying is None or results is None:
+        return None
+    # Early seasons list shared drives as two results for one driver, hence 1:m
+    quali_race = qualifying[['raceid', 'driverid', 'position']].rename(columns={'position': 'position_quali'}).merge(
+        results[['raceid', 'driverid', 'position', 'points']].rename(columns={'position': 'position_race'}),
+        on=['raceid', 'driverid'],
+        how='inner',
+        sort=False,
+        validate='1:m'
+    )
+    # Calculate position changes
+    quali_race['position_change'] = quali_race['position_quali'] - quali_race['position_race']
+    return quali_race.set_index('raceid', drop=False).rename_axis(None)
+
+# Per-season aggregates: one column per year, NaN where an id did not appear
+@st.cache_data(show_spinner=False)
+def races_by_year_circuit():
+    races = load_races()
+    return races.value_counts(['year', 'circuitid'], sort=False).unstack('year')
+
+@st.cache_data(show_spinner=False)
+def points_by_year_constructor():
+    races, results = load_races(), load_results()
+    if results is None:
+        return None
+    year = results['raceid'].map(races.set_index('raceid')['year']).rename('year')
+    return results.groupby([year, 'constructorid'], sort=False)['points'].sum().unstack('year')
+
+def sum_over_years(table, years):
+    if years:
+        table = table.reindex(columns=list(years))
+    return table.sum(axis=1, min_count=1).dropna()
+
+def downsample(df, k):
+    # Evenly spaced rows: deterministic and O(k), unlike df.sample
+    n = len(df)
+    return df if n <= k else df.iloc[np.linspace(0, n - 1, k, dtype=np.int64)]
+
+def top_k(df, col, k, largest=False):
+    # O(n) partition plus a k-element sort instead of nsmallest/nlargest;
+    # ties keep row order like keep='first', and NaN rows never make the cut
+    a = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    a = np.where(np.isnan(a), np.inf, -a if largest else a)
+    if len(a) > k:
+        kth = np.partition(a, k - 1)[k - 1]
+        idx = np.flatnonzero(a < kth)
+        idx = np.sort(np.concatenate([idx, np.flatnonzero(a == kth)[:k - len(idx)]]))
+    else:
+        idx = np.arange(len(a))
+    idx = idx[np.isfinite(a[idx])]
+    return df.iloc[idx[np.argsort(a[idx], kind='stable')]]
+
 # Load data
 circuits = load_circuits()
 races = load_races()
@@ -145,8 +288,180 @@ if circuits is None or races is None:
     st.error("❌ Required files missing: circuits.csv and races.csv")
     st.stop()
 
-# Merge datasets
-races_with_circuits = races.merge(circuits, on='circuitid', how='left', suffixes=('_race', '_circuit'))
+# ============================================================================
+# PHASE COMPUTATIONS (cached per season selection)
+# ============================================================================
+@st.cache_data(show_spinner=False, max_entries=8)
+def compute_overview_stats(years):
+    # Scalars only: a rerun doesn't unpickle the season frames just to count rows
+    circuits = load_circuits()
+    pit_stops, results = season_slice(load_pit_stops(), years), season_slice(load_results(), years)
+    return {
+        'circuits': len(circuits),
+        'races': season_race_ids(years).size,  # raceid is unique per race
+        'pit_stops': None if pit_stops is None else len(pit_stops),
+        'results': None if results is None else len(results),
+        'countries': circuits['country'].nunique(),
+    }
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def compute_phase2(years):
+    pit_stops = season_slice(load_pit_stops(), years)
+    if pit_stops is None:
+        return None
+    # Sanity bounds on duration; NaN fails both comparisons
+    duration = pit_stops['duration'].to_numpy()
+    pit_stops = pit_stops.iloc[(duration > 0) & (duration < 300)]
+    if len(pit_stops) == 0:
+        return None
+    duration = pit_stops['duration']
+    fastest_stops = top_k(pit_stops, 'duration', 10)[['raceid', 'driverid', 'stop', 'lap', 'duration']]
+    # Widen before rounding: float32 can't hold 3 decimals exactly (17.308 -> 17.308001)
+    fastest_stops['duration'] = fastest_stops['duration'].astype('float64').round(3)
+    return {
+        'metrics': {
+            'avg': duration.mean(),
+            'fastest': duration.min(),
+            'total': len(pit_stops),
+            'per_race': len(pit_stops) / len(season_race_ids(years)),
+        },
+        'durations': pit_stops.loc[(duration >= 0.5) & (duration <= 60), ['duration']],
+        'stop_counts': pit_stops['stop'].value_counts().sort_index().reset_index(name='count'),
+        'fastest': fastest_stops,
+    }
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def compute_phase3(years):
+    results, constructors = season_slice(load_results(), years), load_constructors()
+    if results is None or constructors is None or len(results) == 0:
+        return None
+    constructors_idx = constructors.set_index('constructorid')[['name']].rename(columns={'name': 'name_constructor'})
+    constructor_points = sum_over_years(points_by_year_constructor(), years)
+    # One int16 view of the positions (NA -> 0) feeds the winners mask and a
+    # bincount distribution: no float conversion, hashing or sort
+    position = results['position'].to_numpy(dtype=np.int16, na_value=0)
+    position_counts = pd.Series(np.bincount(position[position <= 10], minlength=11)[1:], index=pd.RangeIndex(1, 11, name='position'))
+    winners = results['driverid'].to_numpy()[position == 1]
+    top_const = constructors_idx.join(constructor_points.rename('points'), how='inner').groupby('name_constructor', observed=True)['points'].sum().reset_index().sort_values('points', ascending=False).head(10)
+    return {
+        'metrics': {
+            'results': len(results),
+            'points': results['points'].sum(),
+            'winners': np.unique(winners).size,
+            'teams': results['constructorid'].nunique(),
+        },
+        'top_constructors': top_const,
+        'position_counts': position_counts[position_counts > 0],
+    }
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def compute_phase4(years):
+    quali_race = load_quali_race()
+    if quali_race is None:
+        return None
+    quali_race = season_slice(quali_race, years)
+    if len(quali_race) == 0:
+        return None
+    
+    # The metrics share one float view of the change (NaN = no classified finish)
+    change = quali_race['position_change'].to_numpy(dtype=np.float32, na_value=np.nan)
+    
+    top_gainers = top_k(quali_race, 'position_change', 10, largest=True)[
+        ['raceid', 'driverid', 'position_quali', 'position_race', 'position_change', 'points']
+    ]
+    top_gainers.columns = ['Race ID', 'Driver ID', 'Quali Pos', 'Race Pos', 'Gained', 'Points']
+    return {
+        'metrics': {
+            'avg': np.nanmean(change),
+            'best': np.nanmax(change),
+            'worst': np.nanmin(change),
+            'improvers_pct': np.count_nonzero(change > 0) / len(change) * 100,
+        },
+        'changes': quali_race[['position_change']],
+        'sample': downsample(quali_race, 500)[['position_quali', 'position_race']],
+        'top_gainers': top_gainers,
+    }
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def compute_phase5(years):
+    laps = season_slice(load_lap_times(), years)
+    if laps is None or len(laps) == 0:
+        return None
+    time_seconds = laps['time_seconds']
+    # Filter reasonable lap times (30s to 150s)
+    valid_laps = laps[(time_seconds >= 30) & (time_seconds <= 150)]
+    
+    fastest_laps = top_k(laps, 'time_seconds', 10)[
+        ['raceid', 'driverid', 'lap', 'position', 'time_seconds']
+    ]
+    # Widen before rounding: float32 can't hold 3 decimals exactly (55.404 -> 55.403999)
+    fastest_laps['time_seconds'] = fastest_laps['time_seconds'].astype('float64').round(3)
+    fastest_laps.columns = ['Race ID', 'Driver ID', 'Lap', 'Position', 'Time (s)']
+    return {
+        'metrics': {
+            'total': len(laps),
+            'fastest': time_seconds.min(),
+            'avg': time_seconds.mean(),
+            'drivers': laps['driverid'].nunique(),
+        },
+        'lap_time_hist': np.histogram(valid_laps['time_seconds'].to_numpy(), bins=50),
+        # Sample data for performance
+        'sample': downsample(valid_laps, 1000)[['lap', 'time_seconds']],
+        'fastest': fastest_laps,
+    }
+
+# ============================================================================
+# FIGURES (Phases 1-3, cached per season selection)
+# ============================================================================
+@st.cache_data(show_spinner=False, max_entries=8)
+def phase1_figures(years):
+    circuits = load_circuits()
+    circuit_race_counts = sum_over_years(races_by_year_circuit(), years)
+    # Id-indexed name lookup for the precomputed circuit aggregates
+    circuits_idx = circuits.set_index('circuitid')[['name', 'country']].rename(columns={'name': 'name_circuit'})
+    circuit_races = circuits_idx.join(circuit_race_counts.rename('races'), how='inner')
+    
+    # World Map
+    # Id lookup into the per-circuit counts: no merge, one allocation
+    map_data = circuits.assign(race_count=circuits['circuitid'].map(circuit_race_counts).fillna(0).astype('int32'))
+    # Tooltip assembled client-side from hover_data columns
+    fig_map = px.scatter_geo(map_data, lat='lat', lon='lng', hover_name='name',
+        hover_data={'country': True, 'location': True, 'race_count': True, 'lat': False, 'lng': False},
+        size='race_count', size_max=30, color='country', projection='natural earth')
+    # Constant uirevision: the browser keeps pan/zoom when a new season's map arrives
+    fig_map.update_layout(height=500, showlegend=False, uirevision='f1_map')
+    
+    top_circuits = circuit_races.groupby('name_circuit', observed=True)['races'].sum().reset_index().sort_values('races', ascending=False).head(10)
+    fig_circuits = px.bar(top_circuits, x='races', y='name_circuit', orientation='h', color='races', color_continuous_scale='Reds')
+    fig_circuits.update_layout(showlegend=False, yaxis={'categoryorder': 'total ascending'}, height=400)
+    
+    races_by_country = circuit_races.groupby('country', observed=True)['races'].sum().reset_index().sort_values('races', ascending=False).head(10)
+    fig_countries = px.bar(races_by_country, x='races', y='country', orientation='h', color='races', color_continuous_scale='Blues')
+    fig_countries.update_layout(showlegend=False, yaxis={'categoryorder': 'total ascending'}, height=400)
+    return fig_map, fig_circuits, fig_countries
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def phase2_figures(years):
+    phase2 = compute_phase2(years)
+    if phase2 is None:
+        return None
+    fig_durations = px.histogram(phase2['durations'], x='duration', nbins=50, color_discrete_sequence=['#E10600'])
+    fig_durations.update_layout(height=400, showlegend=False)
+    fig_stops = px.bar(phase2['stop_counts'], x='stop', y='count', color='count', color_continuous_scale='Viridis')
+    fig_stops.update_layout(height=400)
+    return fig_durations, fig_stops
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def phase3_figures(years):
+    phase3 = compute_phase3(years)
+    if phase3 is None:
+        return None
+    fig_constructors = px.bar(phase3['top_constructors'], x='points', y='name_constructor', orientation='h', color='points', color_continuous_scale='Reds')
+    fig_constructors.update_layout(yaxis={'categoryorder': 'total ascending'}, height=400, showlegend=False)
+    pos_dist = phase3['position_counts']
+    fig_positions = px.bar(x=pos_dist.index, y=pos_dist.values, color=pos_dist.values, color_continuous_scale='Blues')
+    fig_positions.update_layout(height=400)
+    return fig_constructors, fig_positions
 
 # ============================================================================
 # HEADER
@@ -168,13 +483,8 @@ selected_years = st.sidebar.multiselect(
     default=[available_years[0]] if len(available_years) > 0 else []
 )
 
-# Apply filters
-if selected_years:
-    filtered_races = races_with_circuits[races_with_circuits['year'].isin(selected_years)]
-    filtered_races_ids = filtered_races['raceid'].unique() if 'raceid' in filtered_races.columns else []
-else:
-    filtered_races = races_with_circuits
-    filtered_races_ids = races['raceid'].unique() if 'raceid' in races.columns else []
+# Every cached computation is keyed on the sorted year tuple
+season_key = tuple(sorted(selected_years))
 
 # Dashboard section
 st.sidebar.markdown("---")
@@ -186,40 +496,37 @@ dashboard_section = st.sidebar.radio(
 
 # Data status
 st.sidebar.markdown("---")
-st.sidebar.markdown("### 📁 Data Status")
-st.sidebar.write("✅ Circuits" if circuits is not None else "❌ Circuits")
-st.sidebar.write("✅ Races" if races is not None else "❌ Races")
-st.sidebar.write("✅ Pit Stops" if pit_stops is not None else "❌ Pit Stops")
-st.sidebar.write("✅ Constructors" if constructors is not None else "⚠️ Constructors")
-st.sidebar.write("✅ Results" if results is not None else "❌ Results")
-st.sidebar.write("✅ Qualifying" if qualifying is not None else "⚠️ Qualifying")
-st.sidebar.write("✅ Drivers" if drivers is not None else "⚠️ Drivers")
-st.sidebar.write("✅ Lap Times" if lap_times is not None else "⚠️ Lap Times")
+data_status = [
+    ("Circuits", circuits, "❌"), ("Races", races, "❌"), ("Pit Stops", pit_stops, "❌"),
+    ("Constructors", constructors, "⚠️"), ("Results", results, "❌"), ("Qualifying", qualifying, "⚠️"),
+    ("Drivers", drivers, "⚠️"), ("Lap Times", lap_times, "⚠️"),
+]
+st.sidebar.markdown("### 📁 Data Status\n\n" + "\n\n".join(
+    f"{'✅' if df is not None else missing} {name}" for name, df, missing in data_status))
 
 # ============================================================================
 # OVERVIEW METRICS
 # ============================================================================
 st.subheader("📊 Dashboard Overview")
+overview = compute_overview_stats(season_key)
 col1, col2, col3, col4, col5 = st.columns(5)
 
 with col1:
-    st.metric("🏁 Circuits", len(circuits))
+    st.metric("🏁 Circuits", overview['circuits'])
 with col2:
-    st.metric("🏆 Races", f"{len(filtered_races):,}")
+    st.metric("🏆 Races", f"{overview['races']:,}")
 with col3:
-    if pit_stops is not None:
-        ps_count = len(pit_stops[pit_stops['raceid'].isin(filtered_races_ids)])
-        st.metric("🔧 Pit Stops", f"{ps_count:,}")
+    if overview['pit_stops'] is not None:
+        st.metric("🔧 Pit Stops", f"{overview['pit_stops']:,}")
     else:
         st.metric("🔧 Pit Stops", "N/A")
 with col4:
-    if results is not None:
-        res_count = len(results[results['raceid'].isin(filtered_races_ids)])
-        st.metric("🎯 Results", f"{res_count:,}")
+    if overview['results'] is not None:
+        st.metric("🎯 Results", f"{overview['results']:,}")
     else:
         st.metric("🎯 Results", "N/A")
 with col5:
-    st.metric("🌍 Countries", circuits['country'].nunique())
+    st.metric("🌍 Countries", overview['countries'])
 
 st.markdown("---")
 
@@ -229,30 +536,19 @@ st.markdown("---")
 if dashboard_section in ["Overview", "Phase 1: Circuits"]:
     st.header("🗺️ Phase 1: Circuit Foundation")
     
-    # World Map
-    races_per_circuit = filtered_races.groupby('circuitid').size().reset_index(name='race_count')
-    map_data = circuits.merge(races_per_circuit, on='circuitid', how='left')
-    map_data['race_count'] = map_data['race_count'].fillna(0)
+    fig_map, fig_circuits, fig_countries = phase1_figures(season_key)
     
-    fig_map = px.scatter_geo(map_data, lat='lat', lon='lng', hover_name='name',
-        size='race_count', size_max=30, color='country', projection='natural earth')
-    fig_map.update_layout(height=500, showlegend=False)
+    # World Map
     st.plotly_chart(fig_map, use_container_width=True)
     
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("#### 🏆 Most Raced Circuits")
-        top_circuits = filtered_races.groupby('name_circuit').size().reset_index(name='races').sort_values('races', ascending=False).head(10)
-        fig = px.bar(top_circuits, x='races', y='name_circuit', orientation='h', color='races', color_continuous_scale='Reds')
-        fig.update_layout(showlegend=False, yaxis={'categoryorder': 'total ascending'}, height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_circuits, use_container_width=True)
     
     with col2:
         st.markdown("#### 🌍 Races by Country")
-        races_by_country = filtered_races.groupby('country').size().reset_index(name='races').sort_values('races', ascending=False).head(10)
-        fig = px.bar(races_by_country, x='races', y='country', orientation='h', color='races', color_continuous_scale='Blues')
-        fig.update_layout(showlegend=False, yaxis={'categoryorder': 'total ascending'}, height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_countries, use_container_width=True)
     
     st.markdown("---")
 
@@ -262,44 +558,33 @@ if dashboard_section in ["Overview", "Phase 1: Circuits"]:
 if dashboard_section in ["Overview", "Phase 2: Pit Stops"] and pit_stops is not None:
     st.header("🔧 Phase 2: Pit Stop Strategy")
     
-    filtered_pit_stops = pit_stops[
-        (pit_stops['raceid'].isin(filtered_races_ids)) &
-        (pit_stops['duration'].notna()) & 
-        (pit_stops['duration'] > 0) &
-        (pit_stops['duration'] < 300)
-    ].copy()
-    
-    if len(filtered_pit_stops) > 0:
+    phase2 = compute_phase2(season_key)
+    if phase2 is not None:
+        fig_durations, fig_stops = phase2_figures(season_key)
+        metrics = phase2['metrics']
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("⚡ Avg Pit Stop", f"{filtered_pit_stops['duration'].mean():.3f}s")
+            st.metric("⚡ Avg Pit Stop", f"{metrics['avg']:.3f}s")
         with col2:
-            st.metric("🏆 Fastest Stop", f"{filtered_pit_stops['duration'].min():.3f}s")
+            st.metric("🏆 Fastest Stop", f"{metrics['fastest']:.3f}s")
         with col3:
-            st.metric("🔢 Total Stops", f"{len(filtered_pit_stops):,}")
+            st.metric("🔢 Total Stops", f"{metrics['total']:,}")
         with col4:
-            st.metric("📊 Stops/Race", f"{len(filtered_pit_stops) / len(filtered_races_ids):.1f}")
+            st.metric("📊 Stops/Race", f"{metrics['per_race']:.1f}")
         
         st.markdown("---")
         
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("#### ⚡ Duration Distribution")
-            valid = filtered_pit_stops[(filtered_pit_stops['duration'] >= 0.5) & (filtered_pit_stops['duration'] <= 60)]
-            fig = px.histogram(valid, x='duration', nbins=50, color_discrete_sequence=['#E10600'])
-            fig.update_layout(height=400, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig_durations, use_container_width=True)
         
         with col2:
             st.markdown("#### 🔢 Stop Strategy")
-            stop_counts = filtered_pit_stops.groupby('stop').size().reset_index(name='count')
-            fig = px.bar(stop_counts, x='stop', y='count', color='count', color_continuous_scale='Viridis')
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig_stops, use_container_width=True)
         
         st.markdown("#### 🏆 Top 10 Fastest Pit Stops")
-        fastest = filtered_pit_stops.nsmallest(10, 'duration')[['raceid', 'driverid', 'stop', 'lap', 'duration']]
-        st.dataframe(fastest, use_container_width=True, hide_index=True)
+        st.dataframe(phase2['fastest'], use_container_width=True, hide_index=True)
     
     st.markdown("---")
 
@@ -312,44 +597,30 @@ if dashboard_section in ["Overview", "Phase 3: Performance"] and results is not
     if constructors is None:
         st.warning("⚠️ Upload `constructors.csv` to enable full Phase 3 analysis")
     else:
-        filtered_results = results[results['raceid'].isin(filtered_races_ids)]
-        
-        if len(filtered_results) > 0:
-            perf_data = filtered_results.merge(
-                races[['raceid', 'circuitid', 'year']], on='raceid', how='left'
-            ).merge(
-                constructors[['constructorid', 'name']], on='constructorid', how='left'
-            ).merge(
-                circuits[['circuitid', 'name']], on='circuitid', how='left',
-                suffixes=('_constructor', '_circuit')
-            )
-            
+        phase3 = compute_phase3(season_key)
+        if phase3 is not None:
+            fig_constructors, fig_positions = phase3_figures(season_key)
+            metrics = phase3['metrics']
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("📊 Results", f"{len(filtered_results):,}")
+                st.metric("📊 Results", f"{metrics['results']:,}")
             with col2:
-                st.metric("⭐ Points", f"{filtered_results['points'].sum():,.0f}")
+                st.metric("⭐ Points", f"{metrics['points']:,.0f}")
             with col3:
-                st.metric("🏆 Winners", filtered_results[filtered_results['position'] == 1]['driverid'].nunique())
+                st.metric("🏆 Winners", metrics['winners'])
             with col4:
-                st.metric("🏗️ Teams", filtered_results['constructorid'].nunique())
+                st.metric("🏗️ Teams", metrics['teams'])
             
             st.markdown("---")
             
             col1, col2 = st.columns(2)
             with col1:
                 st.markdown("#### 🏆 Top Constructors")
-                top_const = perf_data.groupby('name_constructor')['points'].sum().reset_index().sort_values('points', ascending=False).head(10)
-                fig = px.bar(top_const, x='points', y='name_constructor', orientation='h', color='points', color_continuous_scale='Reds')
-                fig.update_layout(yaxis={'categoryorder': 'total ascending'}, height=400, showlegend=False)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig_constructors, use_container_width=True)
             
             with col2:
                 st.markdown("#### 🎯 Position Distribution")
-                pos_dist = filtered_results[filtered_results['position'] <= 10]['position'].value_counts().sort_index()
-                fig = px.bar(x=pos_dist.index, y=pos_dist.values, color=pos_dist.values, color_continuous_scale='Blues')
-                fig.update_layout(height=400)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig_positions, use_container_width=True)
     
     st.markdown("---")
 
@@ -362,36 +633,18 @@ if dashboard_section in ["Overview", "Phase 4: Qualifying"] and qualifying is no
     if drivers is None:
         st.warning("⚠️ Upload `drivers.csv` to see driver names")
     
-    # Filter data
-    filtered_quali = qualifying[qualifying['raceid'].isin(filtered_races_ids)]
-    filtered_results = results[results['raceid'].isin(filtered_races_ids)]
-    
-    if len(filtered_quali) > 0 and len(filtered_results) > 0:
-        # Merge qualifying and race results
-        quali_race = filtered_quali.merge(
-            filtered_results[['raceid', 'driverid', 'position', 'points']],
-            on=['raceid', 'driverid'],
-            how='inner',
-            suffixes=('_quali', '_race')
-        )
-        
-        # Calculate position changes
-        quali_race['position_change'] = quali_race['position_quali'] - quali_race['position_race']
-        
+    phase4 = compute_phase4(season_key)
+    if phase4 is not None:
+        metrics = phase4['metrics']
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            avg_change = quali_race['position_change'].mean()
-            st.metric("📊 Avg Position Change", f"{avg_change:+.2f}")
+            st.metric("📊 Avg Position Change", f"{metrics['avg']:+.2f}")
         with col2:
-            best_overtaker = quali_race['position_change'].max()
-            st.metric("🏆 Best Gain", f"+{int(best_overtaker)}")
+            st.metric("🏆 Best Gain", f"+{int(metrics['best'])}")
         with col3:
-            worst_loss = quali_race['position_change'].min()
-            st.metric("📉 Worst Loss", f"{int(worst_loss)}")
+            st.metric("📉 Worst Loss", f"{int(metrics['worst'])}")
         with col4:
-            improvers = (quali_race['position_change'] > 0).sum()
-            pct = improvers / len(quali_race) * 100 if len(quali_race) > 0 else 0
-            st.metric("🔼 Improvers", f"{pct:.1f}%")
+            st.metric("🔼 Improvers", f"{metrics['improvers_pct']:.1f}%")
         
         st.markdown("---")
         
@@ -399,15 +652,17 @@ if dashboard_section in ["Overview", "Phase 4: Qualifying"] and qualifying is no
         
         with col1:
             st.markdown("#### 📊 Position Change Distribution")
-            fig = px.histogram(quali_race, x='position_change', nbins=30, color_discrete_sequence=['#667eea'])
+            fig = px.histogram(phase4['changes'], x='position_change', nbins=30, color_discrete_sequence=['#667eea'])
             fig.update_layout(height=400, xaxis_title="Position Change", yaxis_title="Frequency")
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             st.markdown("#### 🎯 Qualifying vs Race Position")
-            sample_data = quali_race.sample(min(500, len(quali_race)))
-            fig = px.scatter(sample_data, x='position_quali', y='position_race', 
-                opacity=0.6, color_discrete_sequence=['#E10600'])
+            sample_data = phase4['sample']
+            fig = go.Figure(go.Scattergl(
+                x=sample_data['position_quali'].to_numpy(dtype=np.float64, na_value=np.nan),
+                y=sample_data['position_race'].to_numpy(dtype=np.float64, na_value=np.nan),
+                mode='markers', marker=dict(opacity=0.6, color='#E10600'), showlegend=False))
             fig.add_trace(go.Scatter(x=[1, 20], y=[1, 20], mode='lines', 
                 line=dict(dash='dash', color='gray'), name='Perfect Conversion'))
             fig.update_layout(height=400, xaxis_title="Qualifying Position", yaxis_title="Race Position")
@@ -415,11 +670,7 @@ if dashboard_section in ["Overview", "Phase 4: Qualifying"] and qualifying is no
         
         # Top Improvers
         st.markdown("#### 🏆 Top 10 Position Gainers")
-        top_gainers = quali_race.nlargest(10, 'position_change')[
-            ['raceid', 'driverid', 'position_quali', 'position_race', 'position_change', 'points']
-        ].copy()
-        top_gainers.columns = ['Race ID', 'Driver ID', 'Quali Pos', 'Race Pos', 'Gained', 'Points']
-        st.dataframe(top_gainers, use_container_width=True, hide_index=True)
+        st.dataframe(phase4['top_gainers'], use_container_width=True, hide_index=True)
     
     st.markdown("---")
 
@@ -440,21 +691,18 @@ if dashboard_section in ["Overview", "Phase 5: Lap Analysis"]:
         - Race pace trends
         """)
     else:
-        filtered_laps = lap_times[lap_times['raceid'].isin(filtered_races_ids)].copy()
-        
-        if len(filtered_laps) > 0:
-            # Convert milliseconds to seconds
-            filtered_laps['time_seconds'] = filtered_laps['milliseconds'] / 1000
-            
+        phase5 = compute_phase5(season_key)
+        if phase5 is not None:
+            metrics = phase5['metrics']
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("⏱️ Total Laps", f"{len(filtered_laps):,}")
+                st.metric("⏱️ Total Laps", f"{metrics['total']:,}")
             with col2:
-                st.metric("🏆 Fastest Lap", f"{filtered_laps['time_seconds'].min():.3f}s")
+                st.metric("🏆 Fastest Lap", f"{metrics['fastest']:.3f}s")
             with col3:
-                st.metric("📊 Avg Lap Time", f"{filtered_laps['time_seconds'].mean():.3f}s")
+                st.metric("📊 Avg Lap Time", f"{metrics['avg']:.3f}s")
             with col4:
-                st.metric("🎯 Unique Drivers", filtered_laps['driverid'].nunique())
+                st.metric("🎯 Unique Drivers", metrics['drivers'])
             
             st.markdown("---")
             
@@ -462,36 +710,23 @@ if dashboard_section in ["Overview", "Phase 5: Lap Analysis"]:
             
             with col1:
                 st.markdown("#### ⏱️ Lap Time Distribution")
-                # Filter reasonable lap times (30s to 150s)
-                valid_laps = filtered_laps[
-                    (filtered_laps['time_seconds'] >= 30) & 
-                    (filtered_laps['time_seconds'] <= 150)
-                ]
-                fig = px.histogram(valid_laps, x='time_seconds', nbins=50, 
-                    color_discrete_sequence=['#E10600'])
-                fig.update_layout(height=400, xaxis_title="Lap Time (seconds)")
+                counts, edges = phase5['lap_time_hist']
+                fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                    marker_color='#E10600'))
+                fig.update_layout(height=400, bargap=0, xaxis_title="Lap Time (seconds)", yaxis_title="count")
                 st.plotly_chart(fig, use_container_width=True)
             
             with col2:
                 st.markdown("#### 📈 Lap Time Evolution")
-                # Sample data for performance
-                sample_laps = filtered_laps.sample(min(1000, len(filtered_laps)))
-                sample_laps = sample_laps[(sample_laps['time_seconds'] >= 30) & 
-                                         (sample_laps['time_seconds'] <= 150)]
-                
-                fig = px.scatter(sample_laps, x='lap', y='time_seconds', 
-                    opacity=0.3, color_discrete_sequence=['#667eea'])
+                sample_laps = phase5['sample']
+                fig = go.Figure(go.Scattergl(x=sample_laps['lap'].to_numpy(), y=sample_laps['time_seconds'].to_numpy(),
+                    mode='markers', marker=dict(opacity=0.3, color='#667eea')))
                 fig.update_layout(height=400, xaxis_title="Lap Number", yaxis_title="Lap Time (s)")
                 st.plotly_chart(fig, use_container_width=True)
             
             # Fastest laps
             st.markdown("#### 🏆 Top 10 Fastest Laps")
-            fastest_laps = filtered_laps.nsmallest(10, 'time_seconds')[
-                ['raceid', 'driverid', 'lap', 'position', 'time_seconds']
-            ].copy()
-            fastest_laps['time_seconds'] = fastest_laps['time_seconds'].round(3)
-            fastest_laps.columns = ['Race ID', 'Driver ID', 'Lap', 'Position', 'Time (s)']
-            st.dataframe(fastest_laps, use_container_width=True, hide_index=True)
+            st.dataframe(phase5['fastest'], use_container_width=True, hide_index=True)
         else:
             st.info("No lap time data for selected filters")
     
@@ -500,8 +735,7 @@ if dashboard_section in ["Overview", "Phase 5: Lap Analysis"]:
 # ============================================================================
 # FOOTER
 # ============================================================================
-st.markdown("---")
-st.markdown("""
+_FOOTER_HTML = """
     <div style='text-align: center; color: #666; padding: 20px;'>
         <p style='font-size: 1.2em; margin-bottom: 10px;'>
             🏎️ <strong>F1 STRATEGY DASHBOARD - COMPLETE EDITION</strong>
@@ -514,4 +748,7 @@ st.markdown("""
             Built with Streamlit & Plotly | Portfolio Project 2025
         </p>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+st.markdown("---")
+st.markdown(_FOOTER_HTML, unsafe_allow_html=True)